@@ -1,28 +1,207 @@
 import os
-import praw
+import asyncio
+import multiprocessing
+import re
+import time
+import asyncpraw
+import asyncprawcore
+import aiohttp
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from collections import Counter
 from datetime import datetime
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dump_line(obj):
+        return orjson.dumps(obj, default=str) + b'\n'
+else:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dump_line(obj):
+        return (json.dumps(obj, default=str) + '\n').encode()
+
+PUSHSHIFT_URL = "https://api.pushshift.io/reddit/search/submission/"
+
+PERMALINK_BASE = "https://reddit.com/comments/"
+
+# Read credentials once at import; collectors and workers reuse these instead
+# of hitting the environment per instantiation
+REDDIT_CREDENTIALS = {
+    'client_id': os.getenv("REDDIT_CLIENT_ID"),
+    'client_secret': os.getenv("REDDIT_CLIENT_SECRET"),
+    'user_agent': os.getenv("REDDIT_USER_AGENT", "reddit-docker-app"),
+}
+
+# Permalinks are not stored per row; they are derived from the IDs at write
+# time (see _flush_stream and save_data)
+POST_COLUMNS = [
+    'subreddit', 'search_keyword', 'post_id', 'title', 'author',
+    'created_utc', 'score', 'upvote_ratio', 'num_comments', 'url',
+    'selftext', 'link_flair_text', 'is_self'
+]
+
+COMMENT_COLUMNS = [
+    'post_id', 'comment_id', 'author', 'body', 'score', 'created_utc',
+    'is_submitter'
+]
+
+# Low-cardinality string columns worth dict-encoding in both pandas
+# (category dtype) and Parquet (dictionary type)
+CATEGORY_COLUMNS = ('subreddit', 'search_keyword', 'author', 'link_flair_text')
+
+POST_SCHEMA = pa.schema([
+    pa.field('subreddit', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('search_keyword', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('post_id', pa.string()),
+    pa.field('title', pa.string()),
+    pa.field('author', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('created_utc', pa.timestamp('s')),
+    pa.field('score', pa.int64()),
+    pa.field('upvote_ratio', pa.float64()),
+    pa.field('num_comments', pa.int64()),
+    pa.field('url', pa.string()),
+    pa.field('selftext', pa.string()),
+    pa.field('link_flair_text', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('is_self', pa.bool_()),
+    pa.field('permalink', pa.string()),
+])
+
+# Rows buffered in memory before a streaming flush to disk
+STREAM_BATCH_ROWS = 1000
+
+
+class RateLimitedRequestor(asyncprawcore.Requestor):
+    """
+    Requestor that throttles proactively from Reddit's x-ratelimit-* headers.
+
+    asyncprawcore only reacts once the quota is exhausted, by sleeping the
+    whole remaining reset window; with many tasks in flight that one sleep
+    stalls everything. Instead, when the remaining quota runs low, pace
+    requests evenly across the reset window so the hard sleep never fires.
+    """
+
+    # Start pacing once fewer than this many requests remain in the window
+    LOW_WATER_MARK = 30
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._remaining = None
+        self._reset_at = 0.0
+        self._gate = asyncio.Lock()
+
+    async def _acquire(self):
+        """Wait long enough that the remaining quota covers the reset window"""
+        async with self._gate:
+            if self._remaining is not None and self._remaining < self.LOW_WATER_MARK:
+                window = max(self._reset_at - time.monotonic(), 0.0)
+                delay = window / max(self._remaining, 1.0)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+    async def request(self, *args, **kwargs):
+        await self._acquire()
+        response = await super().request(*args, **kwargs)
+
+        headers = response.headers
+        if 'x-ratelimit-remaining' in headers:
+            self._remaining = float(headers['x-ratelimit-remaining'])
+            self._reset_at = time.monotonic() + float(
+                headers.get('x-ratelimit-reset', 0))
+
+        return response
+
+
+def _load_checkpoint(path):
+    """Load a checkpoint mapping query key -> newest created_utc seen"""
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def _save_checkpoint(path, checkpoint):
+    """Write the checkpoint atomically (tempfile + rename)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def build_reddit(client_id=None, client_secret=None, user_agent=None):
+    """Build an asyncpraw.Reddit with the rate-limited requestor (call from
+    within a running event loop)"""
+    return asyncpraw.Reddit(
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent=user_agent or REDDIT_CREDENTIALS['user_agent'],
+        requestor_class=RateLimitedRequestor,
+        requestor_kwargs={'session': aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64))}
+    )
+
+
 class RedditDataCollector:
     """
     Flexible Reddit data collection tool for research purposes.
     Easily configurable for different keywords, subreddits, and time ranges.
     """
-    
-    def __init__(self, client_id, client_secret, user_agent):
-        """Initialize Reddit API connection"""
-        self.reddit = praw.Reddit(
-            client_id=os.getenv("REDDIT_CLIENT_ID"),
-            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-            user_agent=os.getenv("REDDIT_USER_AGENT", "reddit-docker-app")
+
+    def __init__(self, client_id=None, client_secret=None, user_agent=None,
+                 reddit=None, max_concurrency=8):
+        """
+        Initialize Reddit API connection (call from within a running event loop)
+
+        Pass an already-configured asyncpraw.Reddit instance to share one
+        OAuth session across collectors (e.g. one per worker); otherwise a
+        client is built from the given credentials.
+        """
+        self._owns_reddit = reddit is None
+        if reddit is None:
+            reddit = build_reddit(client_id, client_secret, user_agent)
+        self.reddit = reddit
+        # Plain session for archive (Pushshift) requests
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64)
         )
-        
-    def search_posts(self, subreddits, keywords, start_date=None, end_date=None, 
-                     limit=100, sort='relevance', time_filter='all'):
+        self.max_concurrency = max_concurrency
+        # Lazy Redditor objects memoized by name, so enriching author fields
+        # (karma, account age, ...) costs one about/ fetch per unique user
+        self._author_cache = {}
+        # Open writer/file handle while search_posts streams batches to disk;
+        # the lock serializes flushes since ParquetWriter is not thread-safe
+        self._stream_writer = None
+        self._stream_file = None
+        self._flush_lock = asyncio.Lock()
+
+    def _author(self, name):
+        """Return a memoized lazy Redditor for the given username"""
+        return self._author_cache.setdefault(name, self.reddit.redditor(name))
+
+    async def close(self):
+        """Close the collector's HTTP sessions (and the Reddit client if it
+        was built here rather than injected)"""
+        await self._session.close()
+        if self._owns_reddit:
+            await self.reddit.close()
+
+    async def search_posts(self, subreddits, keywords, start_date=None, end_date=None,
+                           limit=100, sort='relevance', time_filter='all',
+                           output_format='dataframe', output_path=None,
+                           checkpoint_path=None, incremental=False):
         """
-        Search Reddit posts across multiple subreddits and keywords
-        
+        Search Reddit posts across multiple subreddits and keywords concurrently
+
         Parameters:
         -----------
         subreddits : list
@@ -39,71 +218,405 @@ class RedditDataCollector:
             Sort method: 'relevance', 'hot', 'top', 'new', 'comments'
         time_filter : str
             Time filter: 'all', 'day', 'hour', 'month', 'week', 'year'
-        
+        output_format : str
+            'dataframe' keeps everything in memory and returns a DataFrame;
+            'parquet' and 'jsonl' flush rows to output_path every
+            STREAM_BATCH_ROWS and return the path, never building a frame
+        output_path : str, optional
+            Destination file for the 'parquet' and 'jsonl' formats
+        checkpoint_path : str, optional
+            JSON file recording the newest created_utc per completed query;
+            on restart, completed queries are skipped so a crashed run does
+            not repeat its HTTP cost. Requires a streaming output_format:
+            rows must be on disk before a query may be marked complete
+        incremental : bool
+            With a checkpoint, re-run completed queries but only fetch posts
+            newer than the recorded timestamp (daily re-run mode)
+
         Returns:
         --------
-        DataFrame with collected posts
+        DataFrame with collected posts, or the output path when streaming
         """
-        all_results = []
-        
-        for subreddit_name in subreddits:
-            print(f"\nSearching r/{subreddit_name}...")
-            
-            try:
-                subreddit = self.reddit.subreddit(subreddit_name)
-                
-                for keyword in keywords:
-                    print(f"  Keyword: '{keyword}'")
-                    
-                    # Search subreddit
-                    for submission in subreddit.search(
-                        keyword, 
-                        limit=limit, 
-                        sort=sort, 
-                        time_filter=time_filter
-                    ):
-                        post_date = datetime.fromtimestamp(submission.created_utc)
-                        
-                        # Apply date filters if specified
-                        if start_date and post_date < start_date:
-                            continue
-                        if end_date and post_date > end_date:
-                            continue
-                        
-                        all_results.append({
-                            'subreddit': subreddit_name,
-                            'search_keyword': keyword,
-                            'post_id': submission.id,
-                            'title': submission.title,
-                            'author': str(submission.author),
-                            'created_utc': post_date,
-                            'score': submission.score,
-                            'upvote_ratio': submission.upvote_ratio,
-                            'num_comments': submission.num_comments,
-                            'url': submission.url,
-                            'selftext': submission.selftext,
-                            'link_flair_text': submission.link_flair_text,
-                            'is_self': submission.is_self,
-                            'permalink': f"https://reddit.com{submission.permalink}"
-                        })
-                        
-            except Exception as e:
-                print(f"  Error in r/{subreddit_name}: {e}")
-                continue
-        
-        df = pd.DataFrame(all_results)
-        
-        # Remove duplicate posts (found with multiple keywords)
+        streaming = output_format in ('parquet', 'jsonl')
+        if streaming and not output_path:
+            raise ValueError(f"output_path is required for '{output_format}'")
+        if checkpoint_path and not streaming:
+            # In-memory collection would mark queries complete while their
+            # rows exist only in this process; a crash then loses the rows
+            # and the next run silently skips the queries that produced them
+            raise ValueError(
+                "checkpoint_path requires output_format 'parquet' or 'jsonl'")
+
+        # One list per column (structure-of-arrays) so pandas builds the
+        # DataFrame without re-parsing dict keys per row
+        cols = {name: [] for name in POST_COLUMNS}
+        # Posts found via multiple keywords are skipped at append time, so no
+        # post-hoc drop_duplicates pass is needed
+        seen = set()
+        sem = asyncio.Semaphore(self.max_concurrency)
+        checkpoint = _load_checkpoint(checkpoint_path) if checkpoint_path else None
+
+        # A non-empty checkpoint means a previous run already streamed rows;
+        # opening output_path below would truncate them before the
+        # completed-query skips even fire. Resumed runs write a fresh part
+        # file and combine the parts afterwards
+        if checkpoint and os.path.exists(output_path):
+            raise FileExistsError(
+                f"'{output_path}' holds rows from the checkpointed run; "
+                f"point the resumed run at a new output_path")
+
+        if output_format == 'parquet':
+            self._stream_writer = pq.ParquetWriter(
+                output_path, POST_SCHEMA, compression='zstd')
+        elif output_format == 'jsonl':
+            self._stream_file = open(output_path, 'wb')
+
+        try:
+            # Archive path: one Pushshift query per keyword (archive traffic
+            # is free of Reddit's quota), fanned out under the semaphore.
+            # return_exceptions=True lets every task finish before we decide,
+            # so no orphaned task mutates cols/seen during the fallback
+            archived = False
+            if start_date and end_date:
+                results = await asyncio.gather(*[
+                    self._archive_keyword(subreddits, keyword, sem, cols,
+                                          seen, start_date, end_date,
+                                          checkpoint, incremental)
+                    for keyword in keywords
+                ], return_exceptions=True)
+
+                failures = [r for r in results if isinstance(r, Exception)]
+                if failures:
+                    print(f"  Pushshift unavailable, falling back to "
+                          f"search: {failures[0]}")
+                    # Start the live search from a clean slate: partially
+                    # archived rows would otherwise be a mix of windows, and
+                    # their IDs in `seen` would suppress live results. The
+                    # stream output gets the same treatment — batches the
+                    # abandoned archive path already flushed must not sit in
+                    # front of the live rows (and with `seen` cleared the
+                    # overlap would be written twice)
+                    for values in cols.values():
+                        values.clear()
+                    seen.clear()
+                    async with self._flush_lock:
+                        if self._stream_writer is not None:
+                            self._stream_writer.close()
+                            self._stream_writer = pq.ParquetWriter(
+                                output_path, POST_SCHEMA, compression='zstd')
+                        if self._stream_file is not None:
+                            self._stream_file.close()
+                            self._stream_file = open(output_path, 'wb')
+                else:
+                    archived = True
+                    if checkpoint is not None:
+                        # Commit the checkpoint only now that every keyword
+                        # task succeeded and the archive path is final — a
+                        # per-keyword save would survive the fallback above
+                        # and make later runs skip keywords whose rows were
+                        # discarded with it. Flush first so the recorded
+                        # queries are on disk, not in the column lists
+                        await self._flush_stream(cols)
+                        for key, newest in (r for r in results if r):
+                            checkpoint[key] = max(newest,
+                                                  checkpoint.get(key, 0))
+                        _save_checkpoint(checkpoint_path, checkpoint)
+
+            # Live path: one compound OR query covers every keyword across
+            # every subreddit, then rows are tagged locally with whichever
+            # keywords actually matched
+            if not archived:
+                await self._search_compound(subreddits, keywords, cols, seen,
+                                            start_date, end_date, limit, sort,
+                                            time_filter, checkpoint_path,
+                                            checkpoint, incremental)
+
+            if streaming:
+                await self._flush_stream(cols)
+                print(f"\nTotal unique posts collected: {len(seen)}")
+                return output_path
+        finally:
+            if self._stream_writer is not None:
+                self._stream_writer.close()
+                self._stream_writer = None
+            if self._stream_file is not None:
+                self._stream_file.close()
+                self._stream_file = None
+
+        df = pd.DataFrame(cols, copy=False)
+        # One vectorized pass beats a datetime construction per row
+        df['created_utc'] = pd.to_datetime(df['created_utc'], unit='s', utc=True)
+        # Dict-encode the repetitive string columns up front: one str object
+        # per distinct value instead of one per row
+        for column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype('category')
+
         if len(df) > 0:
-            df = df.drop_duplicates(subset=['post_id'], keep='first')
             print(f"\nTotal unique posts collected: {len(df)}")
-        
+
         return df
-    
-    def get_comments(self, post_ids, top_level_only=True, limit=None):
+
+    async def _flush_stream(self, cols):
+        """Write the buffered rows to the streaming output and clear them
+
+        The batch is snapshotted and serialized + written on a worker thread
+        (asyncio.to_thread), so the event loop keeps search/comment requests
+        in flight while the disk write completes instead of stalling on it.
+        Flushes are serialized by the lock: producers can fill another batch
+        while one write is in progress, and that flush then waits its turn
+        rather than handing the writer a second concurrent write_table.
+        """
+        if not cols['post_id']:
+            return
+        if self._stream_writer is None and self._stream_file is None:
+            # No stream open (in-memory collection): leave the rows in the
+            # column lists for the DataFrame build instead of dropping them
+            return
+
+        batch = {name: values[:] for name, values in cols.items()}
+        for values in cols.values():
+            values.clear()
+
+        async with self._flush_lock:
+            await asyncio.to_thread(self._write_batch, batch)
+
+    def _write_batch(self, batch):
+        """Blocking half of a streaming flush; runs on a worker thread"""
+        if self._stream_writer is not None:
+            data = dict(batch)
+            data['created_utc'] = pa.array(
+                [int(ts) for ts in batch['created_utc']], type=pa.int64()
+            ).cast(pa.timestamp('s'))
+            data['permalink'] = [f"{PERMALINK_BASE}{post_id}"
+                                 for post_id in batch['post_id']]
+            table = pa.Table.from_pydict(data, schema=POST_SCHEMA)
+            self._stream_writer.write_table(table)
+        elif self._stream_file is not None:
+            for row in zip(*(batch[name] for name in POST_COLUMNS)):
+                record = dict(zip(POST_COLUMNS, row))
+                record['permalink'] = f"{PERMALINK_BASE}{record['post_id']}"
+                self._stream_file.write(_json_dump_line(record))
+
+    async def _pushshift_ids(self, subreddits, keyword, start_date, end_date):
+        """
+        Query the Pushshift archive for post IDs matching a keyword across
+        subreddits within a date window, paginating on created_utc
+
+        Returns a list of post IDs; raises on HTTP errors so callers can fall
+        back to a live Reddit search.
+        """
+        ids = []
+        after = int(start_date.timestamp())
+        before = int(end_date.timestamp())
+
+        while True:
+            async with self._session.get(
+                PUSHSHIFT_URL,
+                params={
+                    'subreddit': ','.join(subreddits),
+                    'q': keyword,
+                    'after': after,
+                    'before': before,
+                    'size': 500,
+                    'sort': 'asc',
+                    'sort_type': 'created_utc'
+                }
+            ) as response:
+                response.raise_for_status()
+                payload = await response.json(loads=_json_loads)
+                data = payload.get('data', [])
+
+            if not data:
+                break
+
+            ids.extend(item['id'] for item in data)
+            # Resume pagination just past the newest item in this page
+            after = int(data[-1]['created_utc']) + 1
+
+        return ids
+
+    async def _archive_keyword(self, subreddits, keyword, sem, cols, seen,
+                               start_date, end_date, checkpoint=None,
+                               incremental=False):
+        """Collect one keyword's posts from the Pushshift archive
+
+        Pushshift filters by date server-side, so only post IDs inside the
+        window are hydrated (100 per /api/info/ call) instead of scanning
+        search results and dropping most of them.
+
+        Returns the (checkpoint key, newest created_utc) pair for the caller
+        to commit once every keyword has succeeded — saving here would let a
+        later fallback discard the rows while the checkpoint keeps the
+        keyword marked complete. Returns None when the keyword is skipped.
+        """
+        key = f"{','.join(subreddits)}|{keyword}"
+        if checkpoint is not None and key in checkpoint:
+            if not incremental:
+                print(f"Skipping '{keyword}' (already in checkpoint)")
+                return
+            # Only fetch posts newer than the last completed run
+            start_date = max(start_date,
+                             datetime.fromtimestamp(checkpoint[key]))
+
+        newest = 0
+        async with sem:
+            print(f"Querying archive for '{keyword}'...")
+
+            ids = await self._pushshift_ids(
+                subreddits, keyword, start_date, end_date
+            )
+            for i in range(0, len(ids), 100):
+                chunk = ids[i:i + 100]
+                listing = await self.reddit.request(
+                    method='GET',
+                    path='/api/info/',
+                    params={
+                        'id': ','.join(f"t3_{post_id}" for post_id in chunk),
+                        'raw_json': 1
+                    }
+                )
+                for child in listing['data']['children']:
+                    newest = max(newest, child['data']['created_utc'])
+                    await self._append_post(cols, seen, keyword,
+                                            child['data'])
+
+        return key, newest
+
+    async def _search_compound(self, subreddits, keywords, cols, seen,
+                               start_date, end_date, limit, sort, time_filter,
+                               checkpoint_path=None, checkpoint=None,
+                               incremental=False):
+        """Search all subreddits for all keywords with one OR query
+
+        Rows are tagged locally with every keyword whose text appears in the
+        title or selftext; the search_keyword column holds them comma-joined
+        (it can be empty when Reddit matched on something we don't store).
+        """
+        print(f"Searching {len(subreddits)} subreddits for "
+              f"{len(keywords)} keywords...")
+
+        # One compiled alternation scans each row for every keyword at once;
+        # matches are case-insensitive, so map them back to the keyword as
+        # the caller spelled it
+        keyword_pattern = re.compile(
+            '|'.join(re.escape(keyword) for keyword in keywords), re.I)
+        keyword_by_lower = {keyword.lower(): keyword for keyword in keywords}
+
+        key = f"{'+'.join(subreddits)}|{' OR '.join(keywords)}"
+        if checkpoint is not None and key in checkpoint:
+            if not incremental:
+                print("Skipping search (already in checkpoint)")
+                return
+            resume_date = datetime.fromtimestamp(checkpoint[key])
+            start_date = (max(start_date, resume_date)
+                          if start_date else resume_date)
+
+        newest = 0
+        try:
+            per_sub_counts = Counter()
+
+            # Compare raw epoch seconds so no datetime objects are built
+            # on the hot path
+            start_ts = start_date.timestamp() if start_date else None
+            end_ts = end_date.timestamp() if end_date else None
+
+            # Page the raw listing endpoint ourselves: every field we
+            # keep is in the response JSON already, so constructing a
+            # full Submission model per result is pure overhead
+            path = f"/r/{'+'.join(subreddits)}/search"
+            params = {
+                'q': ' OR '.join(f'"{keyword}"' for keyword in keywords),
+                'syntax': 'lucene',
+                'sort': sort,
+                't': time_filter,
+                'restrict_sr': 1,
+                'type': 'link',
+                'limit': 100,
+                'raw_json': 1
+            }
+            # Each subreddit may still contribute up to `limit` posts per
+            # keyword, as with the old one-query-per-keyword scheme
+            per_sub_cap = limit * len(keywords)
+            remaining = per_sub_cap * len(subreddits)
+
+            while remaining > 0:
+                listing = await self.reddit.request(
+                    method='GET', path=path, params=params)
+                children = listing['data']['children']
+                if not children:
+                    break
+
+                for child in children:
+                    d = child['data']
+                    remaining -= 1
+
+                    # Apply date filters if specified
+                    if start_ts and d['created_utc'] < start_ts:
+                        continue
+                    if end_ts and d['created_utc'] > end_ts:
+                        continue
+
+                    # Preserve the per-subreddit cap
+                    if per_sub_counts[d['subreddit']] >= per_sub_cap:
+                        continue
+                    per_sub_counts[d['subreddit']] += 1
+
+                    newest = max(newest, d['created_utc'])
+                    matched = {keyword_by_lower[m.lower()]
+                               for m in keyword_pattern.findall(
+                                   f"{d['title']} {d['selftext']}")}
+                    await self._append_post(
+                        cols, seen, ','.join(sorted(matched)), d)
+
+                params['after'] = listing['data'].get('after')
+                if not params['after']:
+                    break
+
+            if checkpoint is not None:
+                # Persist the rows before marking the query complete, so a
+                # crash after the save cannot lose what the skip assumes
+                # is already on disk
+                await self._flush_stream(cols)
+                checkpoint[key] = max(newest, checkpoint.get(key, 0))
+                _save_checkpoint(checkpoint_path, checkpoint)
+
+        except Exception as e:
+            print(f"  Error searching: {e}")
+
+    async def _append_post(self, cols, seen, keyword, d):
+        """Append one raw submission dict to the column lists, skipping
+        duplicates"""
+        if d['id'] in seen:
+            return
+        seen.add(d['id'])
+
+        author_name = d.get('author') or '[deleted]'
+        if author_name != '[deleted]':
+            # Prime the cache so later enrichment reuses one Redditor per user
+            self._author(author_name)
+
+        cols['subreddit'].append(d['subreddit'])
+        cols['search_keyword'].append(keyword)
+        cols['post_id'].append(d['id'])
+        cols['title'].append(d['title'])
+        cols['author'].append(author_name)
+        cols['created_utc'].append(d['created_utc'])
+        cols['score'].append(d['score'])
+        cols['upvote_ratio'].append(d['upvote_ratio'])
+        cols['num_comments'].append(d['num_comments'])
+        cols['url'].append(d['url'])
+        cols['selftext'].append(d['selftext'])
+        cols['link_flair_text'].append(d['link_flair_text'])
+        cols['is_self'].append(d['is_self'])
+
+        if ((self._stream_writer is not None or self._stream_file is not None)
+                and len(cols['post_id']) >= STREAM_BATCH_ROWS):
+            await self._flush_stream(cols)
+
+    async def get_comments(self, post_ids, top_level_only=True, limit=None):
         """
         Retrieve comments from specified posts
-        
+
         Parameters:
         -----------
         post_ids : list
@@ -112,88 +625,204 @@ class RedditDataCollector:
             If True, only collect top-level comments (no replies)
         limit : int, optional
             Maximum comments per post (None = all)
-        
+
         Returns:
         --------
         DataFrame with collected comments
         """
-        all_comments = []
-        
-        for idx, post_id in enumerate(post_ids):
-            print(f"Collecting comments from post {idx+1}/{len(post_ids)}")
-            
+        cols = {name: [] for name in COMMENT_COLUMNS}
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        # Fetching a comment tree is one network round-trip per post, so fan
+        # out across posts just like the keyword searches
+        await asyncio.gather(*[
+            self._fetch_comments(post_id, idx, len(post_ids), sem, cols,
+                                 top_level_only, limit)
+            for idx, post_id in enumerate(post_ids)
+        ])
+
+        df = pd.DataFrame(cols, copy=False)
+        df['created_utc'] = pd.to_datetime(df['created_utc'], unit='s', utc=True)
+        df['author'] = df['author'].astype('category')
+        return df
+
+    async def _fetch_comments(self, post_id, idx, total, sem, cols,
+                              top_level_only, limit):
+        """Fetch one post's comments from the raw listing and append rows
+
+        One GET of /comments/{id} returns the whole tree as JSON, so there is
+        no CommentForest construction and no separate replace_more call; the
+        depth parameter does the top-level-only cut server-side.
+        """
+        async with sem:
+            print(f"Collecting comments from post {idx+1}/{total}")
+
             try:
-                submission = self.reddit.submission(id=post_id)
-                submission.comments.replace_more(limit=0)
-                
-                if top_level_only:
-                    comments = submission.comments
-                else:
-                    comments = submission.comments.list()
-                
-                for comment in comments:
-                    if isinstance(comment, praw.models.Comment):
-                        all_comments.append({
-                            'post_id': post_id,
-                            'comment_id': comment.id,
-                            'author': str(comment.author),
-                            'body': comment.body,
-                            'score': comment.score,
-                            'created_utc': datetime.fromtimestamp(comment.created_utc),
-                            'is_submitter': comment.is_submitter,
-                            'permalink': f"https://reddit.com{comment.permalink}"
-                        })
-                        
-                        if limit and len(all_comments) >= limit:
-                            break
-                            
+                listing = await self.reddit.request(
+                    method='GET',
+                    path=f"/comments/{post_id}",
+                    params={
+                        'limit': 500,
+                        'depth': 1 if top_level_only else 10,
+                        'raw_json': 1
+                    }
+                )
+
+                # Response is [post listing, comment listing]; t1 entries are
+                # comments, anything else ('more' stubs) is skipped
+                stack = list(listing[1]['data']['children'])
+                while stack:
+                    child = stack.pop()
+                    if child['kind'] != 't1':
+                        continue
+                    d = child['data']
+
+                    if limit and len(cols['comment_id']) >= limit:
+                        break
+
+                    author_name = d.get('author') or '[deleted]'
+                    if author_name != '[deleted]':
+                        self._author(author_name)
+
+                    cols['post_id'].append(post_id)
+                    cols['comment_id'].append(d['id'])
+                    cols['author'].append(author_name)
+                    cols['body'].append(d['body'])
+                    cols['score'].append(d['score'])
+                    cols['created_utc'].append(d['created_utc'])
+                    cols['is_submitter'].append(d['is_submitter'])
+
+                    if not top_level_only and d.get('replies'):
+                        stack.extend(d['replies']['data']['children'])
+
             except Exception as e:
                 print(f"  Error collecting comments from {post_id}: {e}")
-                continue
-        
-        return pd.DataFrame(all_comments)
-    
-    def save_data(self, posts_df, comments_df=None, output_prefix='reddit_data'):
-        """Save collected data to CSV files"""
+
+    def _write_frame(self, df, filename, format):
+        """Write one DataFrame to disk in the requested format"""
+        # Columns are categorical from construction, but re-cast here since
+        # concatenating shards with different categories degrades to object
+        for column in CATEGORY_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+
+        if format == 'parquet':
+            df.to_parquet(filename, compression='zstd', engine='pyarrow')
+        else:
+            # Buffered handle avoids small serialized writes hitting the OS
+            with open(filename, 'wb', buffering=1 << 20) as f:
+                df.to_csv(f, index=False)
+
+    def save_data(self, posts_df, comments_df=None, output_prefix='reddit_data',
+                  format='csv'):
+        """Save collected data to CSV or Parquet files"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        posts_filename = f"{output_prefix}_posts_{timestamp}.csv"
-        posts_df.to_csv(posts_filename, index=False)
+        extension = 'parquet' if format == 'parquet' else 'csv'
+
+        # Permalinks are derived here in one vectorized concatenation rather
+        # than allocated per row during collection (empty frames are skipped:
+        # their columns are float64, which str concatenation rejects)
+        if len(posts_df) > 0:
+            posts_df['permalink'] = PERMALINK_BASE + posts_df['post_id']
+        if comments_df is not None and len(comments_df) > 0:
+            comments_df['permalink'] = (PERMALINK_BASE + comments_df['post_id']
+                                        + '/_/' + comments_df['comment_id'])
+
+        posts_filename = f"{output_prefix}_posts_{timestamp}.{extension}"
+        self._write_frame(posts_df, posts_filename, format)
         print(f"\nPosts saved to: {posts_filename}")
-        
+
         if comments_df is not None and len(comments_df) > 0:
-            comments_filename = f"{output_prefix}_comments_{timestamp}.csv"
-            comments_df.to_csv(comments_filename, index=False)
+            comments_filename = f"{output_prefix}_comments_{timestamp}.{extension}"
+            self._write_frame(comments_df, comments_filename, format)
             print(f"Comments saved to: {comments_filename}")
-        
+
         return posts_filename
 
 
+def _collect_shard(subreddits, credentials, search_kwargs):
+    """Worker entry point: collect one shard of subreddits with its own
+    OAuth app, in its own event loop"""
+    async def _run():
+        reddit = build_reddit(**credentials)
+        collector = RedditDataCollector(reddit=reddit)
+        try:
+            return await collector.search_posts(subreddits=subreddits,
+                                                **search_kwargs)
+        finally:
+            await collector.close()
+            await reddit.close()
+
+    return asyncio.run(_run())
+
+
+def search_posts_sharded(oauth_pool, subreddits, **search_kwargs):
+    """
+    Shard post collection across processes, one OAuth app per worker
+
+    Reddit rate-limits per OAuth token, so K credential sets give K-fold
+    HTTP concurrency that a single client can never reach. Subreddits are
+    partitioned round-robin across the pool and each worker runs a full
+    collector over its shard; the per-shard DataFrames are concatenated.
+
+    Parameters:
+    -----------
+    oauth_pool : list of dict
+        One credentials dict (client_id/client_secret/user_agent) per worker
+    subreddits : list
+        Subreddit names to partition across the workers
+    search_kwargs :
+        Remaining search_posts arguments (keywords, dates, limit, ...);
+        streaming output formats are not supported here since each worker
+        returns its shard as a DataFrame
+    """
+    # pd.concat over worker return values only makes sense for DataFrames;
+    # fail here rather than letting streaming workers hand back file paths
+    output_format = search_kwargs.get('output_format', 'dataframe')
+    if output_format != 'dataframe':
+        raise ValueError(
+            f"search_posts_sharded does not support output_format "
+            f"'{output_format}'; workers return DataFrames")
+
+    shards = [(subreddits[i::len(oauth_pool)], credentials)
+              for i, credentials in enumerate(oauth_pool)]
+    shards = [(shard, credentials) for shard, credentials in shards if shard]
+
+    # Each worker gets its own checkpoint file; processes must not race on
+    # one JSON document
+    jobs = []
+    for i, (shard, credentials) in enumerate(shards):
+        kwargs = dict(search_kwargs)
+        if kwargs.get('checkpoint_path'):
+            kwargs['checkpoint_path'] = f"{kwargs['checkpoint_path']}.{i}"
+        jobs.append((shard, credentials, kwargs))
+
+    # Spawn, not fork: the caller may already have a running event loop,
+    # worker threads, and open TLS sockets, none of which survive a fork
+    with multiprocessing.get_context('spawn').Pool(len(shards)) as pool:
+        frames = pool.starmap(_collect_shard, jobs)
+
+    return pd.concat(frames, ignore_index=True)
+
+
 # ============================================================
 # CONFIGURATION SECTION - MODIFY THIS FOR EACH STUDY
 # ============================================================
 
-def main():
+async def main():
     """Main execution function - configure parameters here"""
-    
-    # API Credentials
-    CONFIG = {
-        'client_id': os.getenv("REDDIT_CLIENT_ID"),
-        'client_secret': os.getenv("REDDIT_CLIENT_SECRET"),
-        'user_agent': os.getenv("REDDIT_USER_AGENT", "reddit-docker-app")
-    }
-    
+
     # Study Parameters - MODIFY THESE FOR EACH PROJECT
     STUDY_CONFIG = {
         # Target subreddits (without r/)
         'subreddits': [
             'Replika',
-            'MyBoyfriendIsAI', 
+            'MyBoyfriendIsAI',
             'CharacterAI',
             'ChatGPT',
             'singularity'
         ],
-        
+
         # Search keywords
         'keywords': [
             'AI boyfriend',
@@ -205,67 +834,104 @@ def main():
             'GPT-5',
             'model update'
         ],
-        
+
         # Date range (set to None for no filtering)
         'start_date': datetime(2025, 8, 1),
         'end_date': datetime(2025, 9, 30),
-        
+
         # Search parameters
         'limit': 100,  # Posts per keyword per subreddit
         'sort': 'relevance',  # 'relevance', 'hot', 'top', 'new', 'comments'
         'time_filter': 'all',  # 'all', 'year', 'month', 'week', 'day', 'hour'
-        
+
+        # Resumability (set a path to skip completed queries on re-run;
+        # incremental=True instead re-fetches only posts newer than the
+        # checkpoint). Checkpointing needs search_posts to stream straight
+        # to disk (output_format 'parquet'/'jsonl'), so it is off here where
+        # results come back as an in-memory DataFrame
+        'checkpoint_path': None,
+        'incremental': False,
+
+        # Concurrency (simultaneous in-flight searches)
+        'max_concurrency': 8,
+
+        # Multi-process sharding: one credentials dict per extra OAuth app,
+        # e.g. [{'client_id': ..., 'client_secret': ..., 'user_agent': ...}].
+        # Empty list = single-process collection with the main credentials
+        'oauth_pool': [],
+
         # Comment collection
         'collect_comments': True,
         'top_level_only': True,
-        
+
         # Output
-        'output_prefix': 'ai_boyfriend_study'
+        'output_prefix': 'ai_boyfriend_study',
+        'output_format': 'csv'  # 'csv' or 'parquet'
     }
-    
-    # Initialize collector
+
+    # One Reddit client (one OAuth handshake) shared with the collector
+    reddit = build_reddit(**REDDIT_CREDENTIALS)
     collector = RedditDataCollector(
-        client_id=CONFIG['client_id'],
-        client_secret=CONFIG['client_secret'],
-        user_agent=CONFIG['user_agent']
-    )
-    
-    # Collect posts
-    print("=== Starting Data Collection ===\n")
-    posts_df = collector.search_posts(
-        subreddits=STUDY_CONFIG['subreddits'],
-        keywords=STUDY_CONFIG['keywords'],
-        start_date=STUDY_CONFIG['start_date'],
-        end_date=STUDY_CONFIG['end_date'],
-        limit=STUDY_CONFIG['limit'],
-        sort=STUDY_CONFIG['sort'],
-        time_filter=STUDY_CONFIG['time_filter']
+        reddit=reddit,
+        max_concurrency=STUDY_CONFIG['max_concurrency']
     )
-    
-    # Collect comments if requested
-    comments_df = None
-    if STUDY_CONFIG['collect_comments'] and len(posts_df) > 0:
-        print("\n=== Collecting Comments ===\n")
-        comments_df = collector.get_comments(
-            post_ids=posts_df['post_id'].tolist(),
-            top_level_only=STUDY_CONFIG['top_level_only']
+
+    try:
+        # Collect posts
+        print("=== Starting Data Collection ===\n")
+        search_kwargs = {
+            'keywords': STUDY_CONFIG['keywords'],
+            'start_date': STUDY_CONFIG['start_date'],
+            'end_date': STUDY_CONFIG['end_date'],
+            'limit': STUDY_CONFIG['limit'],
+            'sort': STUDY_CONFIG['sort'],
+            'time_filter': STUDY_CONFIG['time_filter'],
+            'checkpoint_path': STUDY_CONFIG['checkpoint_path'],
+            'incremental': STUDY_CONFIG['incremental']
+        }
+
+        if STUDY_CONFIG['oauth_pool']:
+            # One process (and rate-limit quota) per OAuth app
+            posts_df = await asyncio.to_thread(
+                search_posts_sharded,
+                STUDY_CONFIG['oauth_pool'],
+                STUDY_CONFIG['subreddits'],
+                **search_kwargs
+            )
+        else:
+            posts_df = await collector.search_posts(
+                subreddits=STUDY_CONFIG['subreddits'],
+                **search_kwargs
+            )
+
+        # Collect comments if requested
+        comments_df = None
+        if STUDY_CONFIG['collect_comments'] and len(posts_df) > 0:
+            print("\n=== Collecting Comments ===\n")
+            comments_df = await collector.get_comments(
+                post_ids=posts_df['post_id'].tolist(),
+                top_level_only=STUDY_CONFIG['top_level_only']
+            )
+
+        # Save data
+        print("\n=== Saving Data ===")
+        collector.save_data(
+            posts_df=posts_df,
+            comments_df=comments_df,
+            output_prefix=STUDY_CONFIG['output_prefix'],
+            format=STUDY_CONFIG['output_format']
         )
-    
-    # Save data
-    print("\n=== Saving Data ===")
-    collector.save_data(
-        posts_df=posts_df,
-        comments_df=comments_df,
-        output_prefix=STUDY_CONFIG['output_prefix']
-    )
-    
-    # Display summary
-    print(f"\n=== Collection Summary ===")
-    print(f"Total posts: {len(posts_df)}")
-    if comments_df is not None:
-        print(f"Total comments: {len(comments_df)}")
-    print("\nCollection complete!")
+
+        # Display summary
+        print(f"\n=== Collection Summary ===")
+        print(f"Total posts: {len(posts_df)}")
+        if comments_df is not None:
+            print(f"Total comments: {len(comments_df)}")
+        print("\nCollection complete!")
+    finally:
+        await collector.close()
+        await reddit.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())